@@ -8,8 +8,30 @@ class History:
     def __init__(self, history_file: str):
         self.history_file = history_file
         self.logger = Logger.initialize_logger("logs/interpreter.log")
+        self._migrate_legacy_history()
 
-    def save_history_json(self, task, mode, os_name, language, prompt, code_snippet, code_output, model_name):
+    def _migrate_legacy_history(self):
+        """Converts the legacy JSON history file next to the JSONL history file, if no JSONL history exists yet."""
+        legacy_file = os.path.splitext(self.history_file)[0] + ".json"
+        if legacy_file == self.history_file or os.path.isfile(self.history_file) or not os.path.isfile(legacy_file):
+            return
+
+        try:
+            if os.path.getsize(legacy_file) == 0:
+                return
+            with open(legacy_file, "r") as history_file:
+                data = json.load(history_file)
+
+            # Write to a temporary file first so an interrupted migration is retried on the next start.
+            temp_file = self.history_file + ".tmp"
+            with open(temp_file, "w") as history_file:
+                history_file.writelines(json.dumps(entry) + "\n" for entry in data)
+            os.replace(temp_file, self.history_file)
+            self.logger.info(f"Migrated {len(data)} history entries from {legacy_file} to {self.history_file}")
+        except Exception as exception:
+            self.logger.error(f"Error in migrating history from JSON: {str(exception)}")
+
+    def append_history_jsonl(self, task, mode, os_name, language, prompt, code_snippet, code_output, model_name):
         try:
             history_entry = {
                 "assistant": {
@@ -26,27 +48,29 @@ class History:
                 }
             }
 
-            data = []
-            if os.path.isfile(self.history_file) and os.path.getsize(self.history_file) > 0:
-                with open(self.history_file, "r") as history_file:  # Open the file in read mode
-                    data = json.load(history_file)
+            # Append a single JSON line instead of rewriting the whole history.
+            directory = os.path.dirname(self.history_file)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
 
-            data.append(history_entry)
-
-            with open(self.history_file, "w") as history_file:
-                json.dump(data, history_file)
+            with open(self.history_file, "a") as history_file:
+                history_file.write(json.dumps(history_entry) + "\n")
         except Exception as exception:
-            self.logger.error(f"Error in saving history to JSON: {str(exception)}")
+            self.logger.error(f"Error in saving history to JSONL: {str(exception)}")
             raise
 
+    def _read_history(self) -> List[dict]:
+        """Returns all entries of the JSONL history file."""
+        if not os.path.isfile(self.history_file):
+            return []
+
+        with open(self.history_file, 'r') as file:
+            return [json.loads(line) for line in file if line.strip()]
+
     def _get_data_for_key(self, key: str) -> List[Any]:
         """Returns a list of all values for the specified key in the history data."""
         try:
-            if os.path.getsize(self.history_file) > 0:
-                with open(self.history_file, 'r') as file:
-                    history_data = json.load(file)
-            else:
-                return []
+            history_data = self._read_history()
             
             specific_data = []
             for entry in history_data:
@@ -63,8 +87,7 @@ class History:
     def _get_last_entries(self, count: int) -> List[dict]:
         """Returns the last n entries from the history data."""
         try:
-            with open(self.history_file, 'r') as file:
-                history_data = json.load(file)
+            history_data = self._read_history()
             last_entries = history_data[-count:]
             self.logger.info(f'Successfully retrieved last {count} entries from history')
             return last_entries
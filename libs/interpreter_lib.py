@@ -11,20 +11,79 @@ This file contains the `Interpreter` class which is responsible for:
 - Logging all important actions and errors for debugging and traceability.
 """
 
+import asyncio
+import functools
+import hashlib
+import json
+import logging
 import os
+import pathlib
+import re
+import stat
 import subprocess
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 from libs.code_interpreter import CodeInterpreter
-from litellm import completion
 from libs.history_manager import History
 from libs.logger import Logger
 from libs.markdown_code import display_code, display_markdown_message
 from libs.package_manager import PackageManager
 from libs.utility_manager import UtilityManager
-from dotenv import load_dotenv
 import shlex
 
+# Keywords in the prompt that request a graph, chart or table artifact.
+# Whole words only, so 'stable' or 'Matplotlib' do not trigger an artifact, but plurals and verb forms still do.
+_GRAPH_RE = re.compile(r'\bgraph(?:s|ed|ing)?\b', re.I)
+_CHART_RE = re.compile(r'\b(?:chart(?:s|ed|ing)?|plot(?:s|ted|ting)?)\b', re.I)
+_TABLE_RE = re.compile(r'\btables?\b', re.I)
+
+# Attachments that are read as text, CSV files are summarized by their headers and other types are binary.
+_TEXT_EXTS = frozenset({'.json', '.xml', '.txt', '.md', '.html', '.svg'})
+
+# Instructions appended to the prompt for each requested artifact, keyed by (language, artifact).
+_SUFFIXES = {
+    ('python', 'graph'): "using Python use Matplotlib save the graph in file called 'graph.png'",
+    ('javascript', 'graph'): "using JavaScript use Chart.js save the graph in file called 'graph.png'",
+    ('python', 'chart'): "using Python use Plotly save the chart in file called 'chart.png'",
+    ('javascript', 'chart'): "using JavaScript use Chart.js save the chart in file called 'chart.png'",
+    ('python', 'table'): "using Python use Pandas save the table in file called 'table.md'",
+    ('javascript', 'table'): "using JavaScript use DataTables save the table in file called 'table.html'",
+}
+
+# Script language and script type for each operating system.
+_SCRIPT_LANGUAGES = {'macos': 'applescript', 'linux': 'bash', 'windows': 'powershell'}
+_SCRIPT_TYPES = {'macos': 'Apple script', 'linux': 'Bash Shell script', 'windows': 'Powershell script'}
+
+# Maximum number of generated responses kept in the prompt cache.
+_PROMPT_CACHE_SIZE = 256
+
+# Errors that mean a package is missing and should be installed.
+_MODULE_ERROR_RE = re.compile(r'ModuleNotFound|ImportError|No module named|Cannot find module')
+
+async def acompletion(*args, **kwargs):
+    # litellm pulls in every provider SDK, import it on the first request instead of at startup.
+    from litellm import acompletion as litellm_acompletion
+    return await litellm_acompletion(*args, **kwargs)
+
+@functools.cache
+def _ensure_dotenv():
+    # Load the .env file once per process, then fall back to the current working directory.
+    from dotenv import load_dotenv
+    load_dotenv()
+    load_dotenv(dotenv_path=os.path.join(os.getcwd(), ".env"))
+
+@functools.lru_cache(maxsize=4)
+def _load_system_message(path: str) -> str:
+    with open(path, 'r') as file:
+        return file.read()
+
+@functools.lru_cache(maxsize=32)
+def _load_config(path: str) -> dict:
+    return UtilityManager().read_config_file(path)
+
 class Interpreter:
     logger = None
     client = None
@@ -34,7 +93,7 @@ class Interpreter:
         self.args = args
         self.history = []
         self.history_count = 3
-        self.history_file = "history/history.json"
+        self.history_file = "history/history.jsonl"
         self.utility_manager = UtilityManager()
         self.code_interpreter = CodeInterpreter()
         self.package_manager = PackageManager()
@@ -44,6 +103,8 @@ class Interpreter:
         self.config_values = None
         self.system_message = ""
         self.gemini_vision = None
+        self.prompt_cache = OrderedDict()
+        self.executor = ThreadPoolExecutor(max_workers=1)
         self.initialize()
     
     def initialize(self):
@@ -52,8 +113,6 @@ class Interpreter:
         self.EXECUTE_CODE = self.args.exec
         self.DISPLAY_CODE = self.args.display_code
         self.INTERPRETER_MODEL = self.args.model if self.args.model else None
-        self.logger.info(f"Interpreter args model selected is '{self.args.model}")
-        self.logger.info(f"Interpreter model selected is '{self.INTERPRETER_MODEL}")
         self.system_message = ""
         self.INTERPRETER_MODE = 'code'
         
@@ -70,10 +129,9 @@ class Interpreter:
         else:
             # Open file system_message.txt to a variable system_message
             try:
-                with open('system/system_message.txt', 'r') as file:
-                    self.system_message = file.read()
-                    if self.system_message != "":
-                        self.logger.info(f"System message read successfully")
+                self.system_message = _load_system_message('system/system_message.txt')
+                if self.system_message != "":
+                    self.logger.info(f"System message read successfully")
             except Exception as exception:
                 self.logger.error(f"Error occurred while reading system_message.txt: {str(exception)}")
                 raise
@@ -82,17 +140,20 @@ class Interpreter:
         self.initialize_client()
         self.initialize_mode()
         
+        # Load readline history in the background, it is only needed once the user starts typing.
+        self.readline_thread = threading.Thread(target=self.initialize_readline_history, daemon=True)
+        self.readline_thread.start()
+
+    def initialize_readline_history(self):
         try: # Make this as optional step to have readline history.
             self.utility_manager.initialize_readline_history()
         except:
             self.logger.error(f"Exception on initializing readline history")
 
     def initialize_client(self):
-        load_dotenv()
+        _ensure_dotenv()
         hf_model_name = ""
-        self.logger.info("Initializing Client")
-        
-        self.logger.info(f"Interpreter model selected is '{self.INTERPRETER_MODEL}")
+        self.logger.info("Initializing Client, args model selected is '%s', interpreter model selected is '%s'", self.args.model, self.INTERPRETER_MODEL)
         if self.INTERPRETER_MODEL is None or self.INTERPRETER_MODEL == "":
             self.logger.info("HF_MODEL is not provided, using default model.")
             self.INTERPRETER_MODEL = self.INTERPRETER_MODEL
@@ -102,19 +163,34 @@ class Interpreter:
             config_file_name = f"configs/{self.INTERPRETER_MODEL}.config"
         
         self.logger.info(f"Reading config file {config_file_name}")    
-        self.config_values = self.utility_manager.read_config_file(config_file_name)
+        self.config_values = dict(_load_config(config_file_name)) # Copy so the cached config is never mutated.
         self.INTERPRETER_MODEL = str(self.config_values.get('HF_MODEL', self.INTERPRETER_MODEL))       
         hf_model_name = self.INTERPRETER_MODEL.strip().split("/")[-1]
         
         self.logger.info(f"Using model {hf_model_name}")
+
+        # Resolve the model provider and its completion handler once instead of on every request.
+        self._provider = self.get_model_provider(self.INTERPRETER_MODEL)
+        self._completion_fn = {
+            'gpt': self._call_gpt,
+            'palm': self._call_palm,
+            'gemini': self._call_gemini,
+            'local': self._call_local,
+            'hf': self._call_hf
+        }[self._provider]
+
+        # Model name passed to litellm, resolved once so completion calls never rewrite INTERPRETER_MODEL.
+        if self._provider == 'palm':
+            self._completion_model = "palm/chat-bison"
+        elif self._provider == 'gemini':
+            self._completion_model = "gemini/gemini-pro"
+        elif self._provider == 'hf' and 'huggingface/' not in self.INTERPRETER_MODEL:
+            # Add huggingface/ if not present in the model name.
+            self._completion_model = 'huggingface/' + self.INTERPRETER_MODEL
+        else:
+            self._completion_model = self.INTERPRETER_MODEL
         
-        if "gpt" in self.INTERPRETER_MODEL:
-            if os.getenv("OPENAI_API_KEY") is None:
-                load_dotenv()
-            if os.getenv("OPENAI_API_KEY") is None:
-                # if there is no .env file, try to load from the current working directory
-                load_dotenv(dotenv_path=os.path.join(os.getcwd(), ".env"))
-                
+        if self._provider == 'gpt':
             # Read the token from the .env file
             hf_key = os.getenv('OPENAI_API_KEY')
             if not hf_key:
@@ -131,12 +207,6 @@ class Interpreter:
             if model in self.INTERPRETER_MODEL:
                 self.logger.info(f"User has agreed to terms and conditions of {model}")
 
-                if os.getenv(api_key_name) is None:
-                    load_dotenv()
-                if os.getenv(api_key_name) is None:
-                    # if there is no .env file, try to load from the current working directory
-                    load_dotenv(dotenv_path=os.path.join(os.getcwd(), ".env"))
-
                 api_key = os.getenv(api_key_name)
                 # Validate the token
                 if not api_key:
@@ -144,12 +214,6 @@ class Interpreter:
                 elif " " in api_key or len(api_key) <= 15:
                     raise Exception(f"{api_key_name} should have no spaces, length greater than 15. Please check your .env file.")
         else:
-            if os.getenv("HUGGINGFACE_API_KEY") is None:
-                load_dotenv()
-            if os.getenv("HUGGINGFACE_API_KEY") is None:
-                # if there is no .env file, try to load from the current working directory
-                load_dotenv(dotenv_path=os.path.join(os.getcwd(), ".env"))
-                
             # Read the token from the .env file
             hf_key = os.getenv('HUGGINGFACE_API_KEY')
             if not hf_key:
@@ -217,9 +281,13 @@ class Interpreter:
             raise
 
     def generate_content(self,message, chat_history: list[tuple[str, str]], temperature=0.1, max_tokens=1024,config_values=None,image_file=None):
-        self.logger.info(f"Generating content with args: message={message}, chat_history={chat_history}, temperature={temperature}, max_tokens={max_tokens}, config_values={config_values}, image_file={image_file}")
+        return asyncio.run(self.agenerate_content(message, chat_history, temperature, max_tokens, config_values, image_file))
+
+    async def agenerate_content(self,message, chat_history: list[tuple[str, str]], temperature=0.1, max_tokens=1024,config_values=None,image_file=None):
+        self.logger.info("Generating content with args: message=%s, chat_history=%s, temperature=%s, max_tokens=%s, config_values=%s, image_file=%s", message, chat_history, temperature, max_tokens, config_values, image_file)
 
         # Use the values from the config file if they are provided
+        api_base = 'None'
         if config_values:
             temperature = float(config_values.get('temperature', temperature))
             max_tokens = int(config_values.get('max_tokens', max_tokens))
@@ -228,99 +296,221 @@ class Interpreter:
         # Get the system prompt
         messages = self.get_prompt(message, chat_history)
         
-        # Check if the model is GPT 3.5/4
-        if 'gpt' in self.INTERPRETER_MODEL:
-            self.logger.info("Model is GPT 3.5/4.")
-            if api_base != 'None':
-                # Set the custom language model provider
-                custom_llm_provider = "openai"
-                self.logger.info(f"Custom API mode selected for OpenAI, api_base={api_base}")
-                response = completion(self.INTERPRETER_MODEL, messages=messages, temperature=temperature, max_tokens=max_tokens, api_base=api_base, custom_llm_provider=custom_llm_provider)
-            else:
-                self.logger.info(f"Default API mode selected for OpenAI.")
-                response = completion(self.INTERPRETER_MODEL, messages=messages, temperature=temperature, max_tokens=max_tokens)
-            self.logger.info("Response received from completion function.")
-                
-        # Check if the model is PALM-2
-        elif 'palm' in self.INTERPRETER_MODEL:
-            self.logger.info("Model is PALM-2.")
-            self.INTERPRETER_MODEL = "palm/chat-bison"
-            response = completion(self.INTERPRETER_MODEL, messages=messages,temperature=temperature,max_tokens=max_tokens)
-            self.logger.info("Response received from completion function.")
-        
-        # Check if the model is Gemini Pro
-        elif 'gemini' in self.INTERPRETER_MODEL:
-
-            if self.INTERPRETER_MODE == 'vision':
-                # Import Gemini Vision only if the model is Gemini Pro Vision.
-                try:
-                    from libs.gemini_vision import GeminiVision
-                    self.gemini_vision = GeminiVision()
-                except Exception as exception:
-                    self.logger.error(f"Error importing Gemini Vision: {exception}")
-                    raise
-
-                self.logger.info("Model is Gemini Pro Vision.")
-                response = None
-
-                # Check if image_file is valid.
-                if not image_file:
-                    self.logger.error("Image file is not valid or Corrupted.")
-                    raise ValueError("Image file is not valid or Corrupted.")
-                
-                # Check if image contains URL.
-                if 'http' in image_file or 'https' in image_file or 'www.' in image_file:
-                    self.logger.info("Image contains URL.")
-                    response = self.gemini_vision.gemini_vision_url(prompt=messages,image_url=image_file)
-                else:
-                    self.logger.info("Image contains file.")
-                    response = self.gemini_vision.gemini_vision_path(prompt=messages,image_path=image_file)
-                
-                self.logger.info("Response received from completion function.")
-                return response # Return the response from Gemini Vision because its not coding model.
-            else:
-                self.logger.info("Model is Gemini Pro.")
-                self.INTERPRETER_MODEL = "gemini/gemini-pro"
-                response = completion(self.INTERPRETER_MODEL, messages=messages,temperature=temperature)
-                self.logger.info("Response received from completion function.")
+        # Check if the model is Gemini Pro Vision
+        if self._provider == 'gemini' and self.INTERPRETER_MODE == 'vision':
+            # Import Gemini Vision only if the model is Gemini Pro Vision.
+            try:
+                from libs.gemini_vision import GeminiVision
+                self.gemini_vision = GeminiVision()
+            except Exception as exception:
+                self.logger.error(f"Error importing Gemini Vision: {exception}")
+                raise
+
+            self.logger.info("Model is Gemini Pro Vision.")
+            response = None
+
+            # Check if image_file is valid.
+            if not image_file:
+                self.logger.error("Image file is not valid or Corrupted.")
+                raise ValueError("Image file is not valid or Corrupted.")
             
-        # Check if the model is GPT 3.5/4
-        elif 'local' in self.INTERPRETER_MODEL:
-            self.logger.info("Model is Local model")
-            if api_base != 'None':
-                # Set the custom language model provider
-                custom_llm_provider = "openai"
-                self.logger.info(f"Custom API mode selected for Local Model, api_base={api_base}")
-                response = completion(self.INTERPRETER_MODEL, messages=messages, temperature=temperature, max_tokens=max_tokens, api_base=api_base, custom_llm_provider=custom_llm_provider)
+            # Check if image contains URL.
+            if 'http' in image_file or 'https' in image_file or 'www.' in image_file:
+                self.logger.info("Image contains URL.")
+                response = await asyncio.to_thread(self.gemini_vision.gemini_vision_url, prompt=messages, image_url=image_file)
             else:
-                raise Exception("Exception api base not set for custom model")
+                self.logger.info("Image contains file.")
+                response = await asyncio.to_thread(self.gemini_vision.gemini_vision_path, prompt=messages, image_path=image_file)
+            
             self.logger.info("Response received from completion function.")
+            return response # Return the response from Gemini Vision because its not coding model.
 
+        # Return the cached response for a prompt that was already answered.
+        cache_key = self._get_prompt_cache_key(messages, temperature, max_tokens, config_values)
+        generated_text = self._get_cached_content(cache_key)
+        if generated_text is not None:
+            return generated_text
 
-        # Check if model are from Hugging Face.
-        else:
-            # Add huggingface/ if not present in the model name.
-            if 'huggingface/' not in self.INTERPRETER_MODEL:
-                self.INTERPRETER_MODEL = 'huggingface/' + self.INTERPRETER_MODEL
-            
-            self.logger.info(f"Model is from Hugging Face. {self.INTERPRETER_MODEL}")
-            response = completion(self.INTERPRETER_MODEL, messages=messages,temperature=temperature,max_tokens=max_tokens)
-            self.logger.info("Response received from completion function.")
+        response = await self._completion_fn(messages, temperature, max_tokens, api_base)
+        self.logger.info("Response received from completion function.")
         
-        self.logger.info(f"Generated text {response}")
+        # Dump the full response only when debugging, it can be several KB.
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Generated text %s", response)
         generated_text = self.utility_manager._extract_content(response)
-        self.logger.info(f"Generated content {generated_text}")
+        self.logger.info("Generated content %s", generated_text)
+        self._cache_content(cache_key, generated_text)
         return generated_text
 
+    def generate_content_stream(self,message, chat_history: list[tuple[str, str]], temperature=0.1, max_tokens=1024,config_values=None):
+        async def collect():
+            return ''.join([text async for text in self.agenerate_content_stream(message, chat_history, temperature, max_tokens, config_values)])
+        return asyncio.run(collect())
+
+    async def agenerate_content_stream(self,message, chat_history: list[tuple[str, str]], temperature=0.1, max_tokens=1024,config_values=None):
+        """
+        Streams the generated content as it arrives from the model.
+        Generation stops as soon as the first code block is closed, the rest of the response is not needed.
+        """
+        self.logger.info("Streaming content with args: message=%s, chat_history=%s, temperature=%s, max_tokens=%s, config_values=%s", message, chat_history, temperature, max_tokens, config_values)
+        start_sep, end_sep = '```', '```'
+
+        # Use the values from the config file if they are provided
+        api_base = 'None'
+        if config_values:
+            temperature = float(config_values.get('temperature', temperature))
+            max_tokens = int(config_values.get('max_tokens', max_tokens))
+            api_base = str(config_values.get('api_base', None)) # Only for OpenAI.
+            start_sep = str(config_values.get('start_sep', start_sep))
+            end_sep = str(config_values.get('end_sep', end_sep))
+
+        # Get the system prompt
+        messages = self.get_prompt(message, chat_history)
+
+        # Return the cached response for a prompt that was already answered.
+        cache_key = self._get_prompt_cache_key(messages, temperature, max_tokens, config_values)
+        cached_text = self._get_cached_content(cache_key)
+        if cached_text is not None:
+            yield cached_text
+            return
+
+        response = await self._completion_fn(messages, temperature, max_tokens, api_base, stream=True)
+
+        # Only the new text plus a short tail of the previous text is searched for a fence, so long responses stay linear.
+        generated_parts = []
+        tail = ""
+        block_opened = False
+        try:
+            async for chunk in response:
+                text = chunk.choices[0].delta.content or ""
+                generated_parts.append(text)
+                yield text
+
+                # Stop once the code block is closed.
+                window = tail + text
+                search_from = 0
+                if not block_opened:
+                    start = window.find(start_sep)
+                    if start == -1:
+                        tail = window[-(len(start_sep) - 1):] if len(start_sep) > 1 else ""
+                        continue
+                    block_opened = True
+                    search_from = start + len(start_sep)
+                if window.find(end_sep, search_from) != -1:
+                    self.logger.info("Code block closed, stopping the stream.")
+                    break
+                tail = window[max(search_from, len(window) - (len(end_sep) - 1)):] if len(end_sep) > 1 else ""
+        finally:
+            # Release the connection when the stream is stopped early.
+            aclose = getattr(response, 'aclose', None)
+            if aclose is not None:
+                await aclose()
+        generated_text = ''.join(generated_parts)
+        self.logger.info("Generated content %s", generated_text)
+        self._cache_content(cache_key, generated_text)
+
+    def _get_prompt_cache_key(self, messages, temperature, max_tokens, config_values=None):
+        # Caching is enabled by default and can be disabled with 'cache = False' in the config file.
+        if config_values and config_values.get('cache', 'True') != 'True':
+            return None
+        messages_digest = hashlib.blake2b(json.dumps(messages, sort_keys=True).encode()).digest()
+        return (self._provider, self._completion_model, temperature, max_tokens, messages_digest)
+
+    def _get_cached_content(self, cache_key):
+        if cache_key is None or cache_key not in self.prompt_cache:
+            return None
+        self.prompt_cache.move_to_end(cache_key)
+        self.logger.info("Response found in prompt cache.")
+        return self.prompt_cache[cache_key]
+
+    def _cache_content(self, cache_key, generated_text):
+        if cache_key is None or not generated_text:
+            return
+        self.prompt_cache[cache_key] = generated_text
+        self.prompt_cache.move_to_end(cache_key)
+        if len(self.prompt_cache) > _PROMPT_CACHE_SIZE:
+            self.prompt_cache.popitem(last=False)
+
+    @staticmethod
+    def get_model_provider(model):
+        if 'gpt' in model:
+            return 'gpt'
+        elif 'palm' in model:
+            return 'palm'
+        elif 'gemini' in model:
+            return 'gemini'
+        elif 'local' in model:
+            return 'local'
+        return 'hf'
+
+    async def _call_gpt(self, messages, temperature, max_tokens, api_base, **kwargs):
+        self.logger.info("Model is GPT 3.5/4.")
+        if api_base != 'None':
+            # Set the custom language model provider
+            custom_llm_provider = "openai"
+            self.logger.info(f"Custom API mode selected for OpenAI, api_base={api_base}")
+            return await acompletion(self._completion_model, messages=messages, temperature=temperature, max_tokens=max_tokens, api_base=api_base, custom_llm_provider=custom_llm_provider, **kwargs)
+
+        self.logger.info(f"Default API mode selected for OpenAI.")
+        return await acompletion(self._completion_model, messages=messages, temperature=temperature, max_tokens=max_tokens, **kwargs)
+
+    async def _call_palm(self, messages, temperature, max_tokens, api_base, **kwargs):
+        self.logger.info("Model is PALM-2.")
+        return await acompletion(self._completion_model, messages=messages,temperature=temperature,max_tokens=max_tokens, **kwargs)
+
+    async def _call_gemini(self, messages, temperature, max_tokens, api_base, **kwargs):
+        self.logger.info("Model is Gemini Pro.")
+        return await acompletion(self._completion_model, messages=messages,temperature=temperature, **kwargs)
+
+    async def _call_local(self, messages, temperature, max_tokens, api_base, **kwargs):
+        self.logger.info("Model is Local model")
+        if api_base == 'None':
+            raise Exception("Exception api base not set for custom model")
+
+        # Set the custom language model provider
+        custom_llm_provider = "openai"
+        self.logger.info(f"Custom API mode selected for Local Model, api_base={api_base}")
+        return await acompletion(self._completion_model, messages=messages, temperature=temperature, max_tokens=max_tokens, api_base=api_base, custom_llm_provider=custom_llm_provider, **kwargs)
+
+    async def _call_hf(self, messages, temperature, max_tokens, api_base, **kwargs):
+        self.logger.info(f"Model is from Hugging Face. {self._completion_model}")
+        return await acompletion(self._completion_model, messages=messages,temperature=temperature,max_tokens=max_tokens, **kwargs)
+
+    def read_file_data(self, file_path):
+        # Check if file extension is .csv, a text type or binary
+        file_extension = os.path.splitext(file_path)[1].lower()
+
+        if file_extension == '.csv':
+            # Read only headers of the csv file
+            file_data = self.utility_manager.read_csv_headers(file_path)
+            self.logger.info(f"Input prompt CSV file_data: '{str(file_data)}'")
+            return file_data
+
+        # Binary files such as spreadsheets, images and archives are not added to the prompt.
+        if file_extension not in _TEXT_EXTS:
+            self.logger.info(f"Skipping binary file data: '{file_path}'")
+            return None
+
+        # Files are under 50 KB, read them in one call and replace undecodable bytes.
+        file_text = pathlib.Path(file_path).read_text(encoding='utf-8', errors='replace')
+
+        if file_extension in ['.json','.xml']:
+            # Split by new line and read only 20 lines
+            file_data = ''.join(file_text.splitlines(keepends=True)[:20])
+            self.logger.info(f"Input prompt JSON/XML file_data: '{str(file_data)}'")
+        else:
+            file_data = file_text
+            self.logger.info(f"Input prompt file_data: '{str(file_data)}'")
+        return file_data
+
     def get_code_prompt(self, task, os_name):
         prompt = f"Generate the code in {self.INTERPRETER_LANGUAGE} language for this task '{task} for Operating System: {os_name}'."
         return prompt
 
     def get_script_prompt(self, task, os_name):
-        language_map = {'macos': 'applescript', 'linux': 'bash', 'windows': 'powershell'}
-        self.INTERPRETER_LANGUAGE = language_map.get(os_name.lower(), 'python')
+        self.INTERPRETER_LANGUAGE = _SCRIPT_LANGUAGES.get(os_name.lower(), 'python')
         
-        script_type = 'Apple script' if os_name.lower() == 'macos' else 'Bash Shell script' if os_name.lower() == 'linux' else 'Powershell script' if os_name.lower() == 'windows' else 'script'
+        script_type = _SCRIPT_TYPES.get(os_name.lower(), 'script')
         prompt = f"\nGenerate {script_type} for this prompt and make this script easy to read and understand for this task '{task} for Operating System is {os_name}'."
         return prompt
 
@@ -406,6 +596,9 @@ class Interpreter:
         display_markdown_message("Welcome to the **Interpreter**. I'm here to **assist** you with your everyday tasks. "
                                   "\nPlease enter your task and I'll do my best to help you out.")
         
+        # Make sure readline and its history are ready before the first prompt.
+        self.readline_thread.join()
+
         while True:
             try:
                 # Main input prompt - System and Assistant.
@@ -527,7 +720,7 @@ class Interpreter:
                     debug_prompt = f"Fix the errors in {self.INTERPRETER_LANGUAGE} language.\nCode is \n'{code_snippet}'\nAnd Error is \n'{code_error}'\n give me output only in code and no other text or explanation. And comment in code where you fixed the error.\n"
                     
                     # Start the LLM Request.
-                    self.logger.info(f"Debug Prompt: {debug_prompt}")
+                    self.logger.info("Debug Prompt: %s", debug_prompt)
                     generated_output = self.generate_content(debug_prompt, self.history, config_values=self.config_values,image_file=extracted_file_name)
 
                     # Extract the code from the generated output.
@@ -612,7 +805,7 @@ class Interpreter:
                 # Get the prompt based on the mode.
                 else:
                     prompt = self.get_mode_prompt(task, os_name)
-                    self.logger.info(f"Prompt init is '{prompt}'")
+                    self.logger.info("Prompt init is '%s'", prompt)
                     
                     # Check if the prompt is empty.
                     if not prompt:
@@ -626,6 +819,7 @@ class Interpreter:
                 self.logger.info(f"Interpreter Mode: {self.INTERPRETER_MODE} Model: {self.INTERPRETER_MODEL}")
 
                 # Check if prompt contains any file uploaded by user.
+                file_data_future = None
                 extracted_file_name = self.utility_manager.extract_file_name(prompt)
                 self.logger.info(f"Input prompt extracted_name: '{extracted_file_name}'")
 
@@ -638,39 +832,20 @@ class Interpreter:
                         self.logger.info("Image contains URL Skipping the file processing.")
                     
                     else:
-                        # Check if the file exists and is a file
-                        if os.path.isfile(full_path):
+                        # Check if the file exists and is a file, with a single stat call.
+                        try:
+                            file_stat = os.stat(full_path)
+                        except OSError:
+                            file_stat = None
+
+                        if file_stat and stat.S_ISREG(file_stat.st_mode):
                             # Check if file size is less than 50 KB
                             file_size_max = 50000
-                            file_size = os.path.getsize(full_path)
+                            file_size = file_stat.st_size
                             self.logger.info(f"Input prompt file_size: '{file_size}'")
                             if file_size < file_size_max:
-                                try:
-                                    with open(full_path, 'r', encoding='utf-8') as file:
-                                        # Check if file extension is .json, .csv, or .xml
-                                        file_extension = os.path.splitext(full_path)[1].lower()
-                                        
-                                        if file_extension in ['.json','.xml']:
-                                            # Split by new line and read only 20 lines
-                                            file_data = '\n'.join(file.readline() for _ in range(20))
-                                            self.logger.info(f"Input prompt JSON/XML file_data: '{str(file_data)}'")
-                                            
-                                        elif file_extension == '.csv':
-                                            # Read only headers of the csv file
-                                            file_data = self.utility_manager.read_csv_headers(full_path)
-                                            self.logger.info(f"Input prompt CSV file_data: '{str(file_data)}'")
-                                            
-                                        else:
-                                            file_data = file.read()
-                                            self.logger.info(f"Input prompt file_data: '{str(file_data)}'")
-                                            
-                                        if any(word in prompt.lower() for word in ['graph', 'graphs', 'chart', 'charts']):
-                                            prompt += "\n" + "This is file data from user input: " + str(file_data) + " use this to analyze the data."
-                                            self.logger.info(f"Input Prompt: '{prompt}'")
-                                        else:
-                                            self.logger.info("The prompt does not contain both 'graph' and 'chart'.")
-                                except Exception as exception:
-                                    self.logger.error(f"Error reading file: {exception}")
+                                # Read the file in the background while the rest of the prompt is prepared.
+                                file_data_future = self.executor.submit(self.read_file_data, full_path)
                             else:
                                 self.logger.warning("File size is greater.")
                         else:
@@ -678,29 +853,44 @@ class Interpreter:
                 else:
                     self.logger.info("No file name found in the prompt.")
             
+                # Check which artifacts were requested.
+                graph_requested = _GRAPH_RE.search(prompt) is not None
+                chart_requested = _CHART_RE.search(prompt) is not None
+                table_requested = _TABLE_RE.search(prompt) is not None
+
+                # Collect the prompt parts and join them once.
+                prompt_parts = [prompt]
+
+                # Add the file data to the prompt once it has been read.
+                if file_data_future is not None:
+                    try:
+                        file_data = file_data_future.result()
+                        if file_data is None:
+                            self.logger.info("No text file data to add to prompt.")
+                        elif graph_requested or chart_requested:
+                            prompt_parts.append("This is file data from user input: " + str(file_data) + " use this to analyze the data.")
+                            self.logger.info("Input file data added to prompt.")
+                        else:
+                            self.logger.info("The prompt does not contain both 'graph' and 'chart'.")
+                    except Exception as exception:
+                        self.logger.error(f"Error reading file: {exception}")
+
                 # If graph were requested.
-                if any(word in prompt.lower() for word in ['graph', 'graphs']):
-                    if self.INTERPRETER_LANGUAGE == 'python':
-                        prompt += "\n" + "using Python use Matplotlib save the graph in file called 'graph.png'"
-                    elif self.INTERPRETER_LANGUAGE == 'javascript':
-                        prompt += "\n" + "using JavaScript use Chart.js save the graph in file called 'graph.png'"
+                if graph_requested and (self.INTERPRETER_LANGUAGE, 'graph') in _SUFFIXES:
+                    prompt_parts.append(_SUFFIXES[(self.INTERPRETER_LANGUAGE, 'graph')])
 
                 # if Chart were requested
-                if any(word in prompt.lower() for word in ['chart', 'charts', 'plot', 'plots']):    
-                    if self.INTERPRETER_LANGUAGE == 'python':
-                        prompt += "\n" + "using Python use Plotly save the chart in file called 'chart.png'"
-                    elif self.INTERPRETER_LANGUAGE == 'javascript':
-                        prompt += "\n" + "using JavaScript use Chart.js save the chart in file called 'chart.png'"
+                if chart_requested and (self.INTERPRETER_LANGUAGE, 'chart') in _SUFFIXES:
+                    prompt_parts.append(_SUFFIXES[(self.INTERPRETER_LANGUAGE, 'chart')])
 
                 # if Table were requested
-                if 'table' in prompt.lower():
-                    if self.INTERPRETER_LANGUAGE == 'python':
-                        prompt += "\n" + "using Python use Pandas save the table in file called 'table.md'"
-                    elif self.INTERPRETER_LANGUAGE == 'javascript':
-                        prompt += "\n" + "using JavaScript use DataTables save the table in file called 'table.html'"
+                if table_requested and (self.INTERPRETER_LANGUAGE, 'table') in _SUFFIXES:
+                    prompt_parts.append(_SUFFIXES[(self.INTERPRETER_LANGUAGE, 'table')])
+
+                prompt = "\n".join(prompt_parts)
                  
                 # Start the LLM Request.     
-                self.logger.info(f"Prompt: {prompt}")
+                self.logger.info("Prompt: %s", prompt)
                 
                 # Add the history as memory.
                 if self.INTERPRETER_HISTORY and self.INTERPRETER_MODE == 'chat':
@@ -709,7 +899,11 @@ class Interpreter:
                 elif self.INTERPRETER_HISTORY and self.INTERPRETER_MODE == 'code':
                     self.history = self.history_manager.get_code_history(self.history_count)
                 
-                generated_output = self.generate_content(prompt, self.history, config_values=self.config_values,image_file=extracted_file_name)
+                # Stream the response when enabled, generation stops once the code block is complete.
+                if self.config_values.get('stream', 'False') == 'True' and self.INTERPRETER_MODE not in ['vision','chat']:
+                    generated_output = self.generate_content_stream(prompt, self.history, config_values=self.config_values)
+                else:
+                    generated_output = self.generate_content(prompt, self.history, config_values=self.config_values,image_file=extracted_file_name)
                 
                 # No extra processing for Vision mode.
                 if self.INTERPRETER_MODE in ['vision','chat']:
@@ -758,15 +952,14 @@ class Interpreter:
                         display_markdown_message(f"Error: {code_error}")
                         
                     # install Package on error.
-                    error_messages = ["ModuleNotFound", "ImportError", "No module named", "Cannot find module"]
-                    if code_error is not None and any(error_message in code_error for error_message in error_messages):
+                    if code_error is not None and _MODULE_ERROR_RE.search(code_error):
                         package_name = self.package_manager.extract_package_name(code_error, self.INTERPRETER_LANGUAGE)
                         if package_name:
                             self.logger.info(f"Installing package {package_name} on interpreter {self.INTERPRETER_LANGUAGE}")
                             self.package_manager.install_package(package_name, self.INTERPRETER_LANGUAGE)
 
-                            # Wait and Execute the code again.
-                            time.sleep(3)
+                            # Wait for the package and Execute the code again.
+                            self.package_manager.wait_for_package(package_name, self.INTERPRETER_LANGUAGE)
                             code_output, code_error = self.execute_code(code_snippet, os_name)
                             if code_output:
                                 self.logger.info(f"{self.INTERPRETER_LANGUAGE} code executed successfully.")
@@ -777,18 +970,12 @@ class Interpreter:
                                 display_markdown_message(f"Error: {code_error}")
                             
                     try:
-                        # Check if graph.png exists and open it.
-                        self.utility_manager._open_resource_file('graph.png')
-                        
-                        # Check if chart.png exists and open it.
-                        self.utility_manager._open_resource_file('chart.png')
-                        
-                        # Check if table.md exists and open it.
-                        self.utility_manager._open_resource_file('table.md')
+                        # Open graph.png, chart.png and table.md if they were generated.
+                        self.utility_manager._open_resource_files(('graph.png', 'chart.png', 'table.md'))
                     except Exception as exception:
                         display_markdown_message(f"Error in opening resource files: {str(exception)}")
                 
-                self.history_manager.save_history_json(task, self.INTERPRETER_MODE, os_name, self.INTERPRETER_LANGUAGE, prompt, code_snippet,code_output, self.INTERPRETER_MODEL)
+                self.history_manager.append_history_jsonl(task, self.INTERPRETER_MODE, os_name, self.INTERPRETER_LANGUAGE, prompt, code_snippet,code_output, self.INTERPRETER_MODEL)
                 
             except Exception as exception:
                 self.logger.error(f"An error occurred: {str(exception)}")
@@ -1,4 +1,5 @@
 import logging
+import os
 from logging.handlers import RotatingFileHandler
 
 class Logger:
@@ -10,6 +11,11 @@ class Logger:
             # Define the logging format
             log_format = ("%(asctime)s [%(levelname)s] [%(filename)s:%(lineno)d] [%(funcName)s] - %(message)s")
 
+            # Create the log directory if it does not exist yet
+            directory = os.path.dirname(filename)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+
             # Create a rotating file handler that will manage log file sizes and backups
             file_handler = RotatingFileHandler(filename, maxBytes=5*1024*1024)  # 5MB per file
             file_handler.setFormatter(logging.Formatter(log_format))
@@ -1,6 +1,10 @@
+import importlib
+import importlib.util
+import os
 import subprocess
 import re
 import logging
+import time
 
 import requests
 
@@ -58,6 +62,27 @@ class PackageManager:
             self.logger.error(exception)
             raise exception
         
+    def wait_for_package(self, package_name, language):
+        # Poll with a short backoff (about 1.5s at most) until the installed package can be resolved.
+        for delay in (0.05, 0.1, 0.2, 0.4, 0.8):
+            if self._is_package_available(package_name, language):
+                self.logger.info(f"Package {package_name} is available")
+                return True
+            time.sleep(delay)
+        self.logger.info(f"Package {package_name} is still not available")
+        return False
+
+    def _is_package_available(self, package_name, language):
+        if language == "python":
+            importlib.invalidate_caches()
+            try:
+                return importlib.util.find_spec(package_name) is not None
+            except (ImportError, ValueError):
+                return False
+        elif language == "javascript":
+            return os.path.isdir(os.path.join("node_modules", package_name))
+        return False
+
     def extract_package_name(self,error,language):
         if language == "python":
             return self._extract_python_package_name(error)
@@ -1,51 +1,148 @@
 import json
 import os
+import pathlib
 import platform
 import re
+import shutil
 import subprocess
+import sys
 from libs.logger import Logger
 import csv
-import glob
-from datetime import datetime
+import functools
 
 from libs.markdown_code import display_markdown_message
 
+# The operating system does not change while the process runs.
+_SYSTEM = platform.system()
+_OS_NAME = {
+    'Darwin': 'MacOS',
+    'Linux': 'Linux',
+    'Windows': 'Windows'
+}.get(_SYSTEM, 'Other')
+_OS_VERSION = platform.version()
+
+# This pattern looks for typical file paths, names, and URLs, then stops at the end of the extension.
+# A match can only start at the beginning of a path-like token and has no nested quantifiers,
+# so scanning stays linear even for long pasted code or stack traces.
+_FILE_RE = re.compile(r"(?<![\w\-.:/\\])[\w\-.:/\\]+\.\w+")
+
+# Generated code files are saved as 'code_%Y_%m_%d-%H_%M_%S.<ext>', hand-saved files are never picked as history.
+_CODE_HISTORY_RE = re.compile(r"[^_]+_(\d{4}_\d{2}_\d{2}-\d{2}_\d{2}_\d{2})\.(py|js)")
+
+# Non-binary and image file extensions that can be attached to a prompt.
+_ALLOWED_EXTS = frozenset({'.json', '.csv', '.xml', '.xls', '.txt', '.md', '.html', '.png', '.jpg', '.jpeg', '.gif', '.svg', '.zip', '.tar', '.gz', '.7z', '.rar'})
+
+# Helper process that opens every file name read from stdin, it exits when stdin is closed.
+# Keeping it alive avoids launching a new opener from the large interpreter process for every file.
+_OPENER_HELPER = """
+import os
+import signal
+import subprocess
+import sys
+
+# Ctrl-C at the interpreter prompt must not reach the helper or the viewers it opens.
+signal.signal(signal.SIGINT, signal.SIG_IGN)
+if os.name == "posix":
+    os.setsid()
+
+open_command = sys.argv[1]
+for line in sys.stdin:
+    filename = line.rstrip("\\n")
+    if not filename:
+        continue
+    try:
+        if open_command == "startfile":
+            os.startfile(filename)
+        else:
+            subprocess.Popen([open_command, filename], close_fds=False, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except OSError as exception:
+        print(f"Error in opening {filename}: {exception}", file=sys.stderr)
+"""
+
+# Help message for the interpreter commands, it never changes so it is built once.
+_HELP_MD = (
+    "Interpreter\n"
+    "\n"
+    "Commands available:\n"
+    "\n"
+    "/exit - Exit the interpreter.\n"
+    "/execute - Execute the last code generated.\n"
+    "/install - Install a package from npm or pip.\n"
+    "/save - Save the last code generated.\n"
+    "/debug - Debug the last code generated.\n"
+    "/mode - Change the mode of interpreter.\n"
+    "/model - Change the model for interpreter.\n"
+    "/language - Change the language of the interpreter.\n"
+    "/history - Use history as memory.\n"
+    "/clear - Clear the screen.\n"
+    "/help - Display this help message.\n"
+    "/version - Display the version of the interpreter.\n"
+    "/log - Switch between Verbose and Silent mode.\n"
+    "/upgrade - Upgrade the interpreter.\n"
+    "/shell - Access the shell.\n"
+)
+
 class UtilityManager:
     def __init__(self):
-        try:
-            if not os.path.exists('logs'):
-                os.makedirs('logs')
-            if not os.path.isfile('logs/interpreter.log'):
-                open('logs/interpreter.log', 'w').close()
-        except Exception as exception:
-            self.logger.error(f"Error in UtilityManager initialization: {str(exception)}")
-            raise
-        self.logger = Logger.initialize_logger("logs/interpreter.log")
+        self._code_history_cache = {}
+
+        # Resolve the platform file opener once, files are handed to a long-lived helper process.
+        self._opener_process = None
+        if _SYSTEM == 'Windows':
+            self._open_command = 'startfile'
+        elif _SYSTEM in ('Darwin', 'Linux'):
+            open_command = 'open' if _SYSTEM == 'Darwin' else 'xdg-open'
+            self._open_command = shutil.which(open_command) or open_command
+        else:
+            self._open_command = None
+        self._opener = self._open_with_helper if self._open_command else lambda filename: None
+
+    @functools.cached_property
+    def logger(self):
+        # Set up the log file on first use, callers that never log skip the file system work.
+        return Logger.initialize_logger("logs/interpreter.log")
+
+    def _open_with_helper(self, filename):
+        # Start the helper on first use and restart it if it has exited.
+        if self._opener_process is None or self._opener_process.poll() is not None:
+            self._opener_process = subprocess.Popen([sys.executable, '-c', _OPENER_HELPER, self._open_command], stdin=subprocess.PIPE, text=True, close_fds=False)
+            self.logger.info(f"Started file opener helper with pid {self._opener_process.pid}")
+
+        self._opener_process.stdin.write(os.path.abspath(filename) + "\n")
+        self._opener_process.stdin.flush()
 
-    def _open_resource_file(self,filename):
+    def _open_resource_files(self, filenames):
         try:
-            if os.path.isfile(filename):
-                if platform.system() == "Windows":
-                    subprocess.call(['start', filename], shell=True)
-                elif platform.system() == "Darwin":
-                    subprocess.call(['open', filename])
-                elif platform.system() == "Linux":
-                    subprocess.call(['xdg-open', filename])
-                self.logger.info(f"{filename} exists and opened successfully")
+            # Read the directory once instead of checking every file separately.
+            with os.scandir('.') as entries:
+                present = {entry.name for entry in entries if entry.name in filenames and entry.is_file()}
+
+            for filename in filenames:
+                if filename in present:
+                    self._opener(filename)
+                    self.logger.info(f"{filename} exists and opened successfully")
         except Exception as exception:
             display_markdown_message(f"Error in opening files: {str(exception)}")
 
     def _clean_responses(self):
         files_to_remove = ['graph.png', 'chart.png', 'table.md']
         for file in files_to_remove:
+            # Unlink directly, a missing file is the common case and costs a single syscall.
             try:
-                if os.path.isfile(file):
-                    os.remove(file)
-                    self.logger.info(f"{file} removed successfully")
-            except Exception as e:
+                os.unlink(file)
+                self.logger.info(f"{file} removed successfully")
+            except FileNotFoundError:
+                pass
+            except OSError as e:
                 print(f"Error in removing {file}: {str(e)}")
     
     def _extract_content(self,output):
+        try:
+            # Fast path for litellm responses, which support attribute access.
+            return output.choices[0].message.content
+        except AttributeError:
+            pass
+
         try:
             return output['choices'][0]['message']['content']
         except (KeyError, TypeError) as e:
@@ -54,20 +151,8 @@ class UtilityManager:
     
     def get_os_platform(self):
         try:
-            import platform
-            os_info = platform.uname()
-            os_name = os_info.system
-
-            os_name_mapping = {
-                'Darwin': 'MacOS',
-                'Linux': 'Linux',
-                'Windows': 'Windows'
-            }
-
-            os_name = os_name_mapping.get(os_name, 'Other')
-
-            self.logger.info(f"Operating System: {os_name} Version: {os_info.version}")
-            return os_name, os_info.version
+            self.logger.info(f"Operating System: {_OS_NAME} Version: {_OS_VERSION}")
+            return _OS_NAME, _OS_VERSION
         except Exception as exception:
             self.logger.error(f"Error in getting OS platform: {str(exception)}")
             raise
@@ -83,56 +168,53 @@ class UtilityManager:
                 import pyreadline as readline
                 
             histfile = os.path.join(os.path.expanduser("~"), ".python_history")
-            readline.read_history_file(histfile)
+            # The history file does not exist on the first run.
+            if os.path.isfile(histfile):
+                readline.read_history_file(histfile)
             
-            # Save history to file on exit
+            # Save history to file on exit, only reached once readline has loaded
             import atexit
             atexit.register(readline.write_history_file, histfile)
-        except FileNotFoundError:
-            pass
         except Exception as exception:
             self.logger.error(f"Error in initializing readline history: {str(exception)}")
             raise
 
     def read_config_file(self, filename=".config"):
         try:
-            config_data = {}
-            with open(filename, "r") as config_file:
-                for line in config_file:
-                    # Ignore comments and lines without an equals sign
-                    if line.strip().startswith('#') or '=' not in line:
-                        continue
-                    key, value = line.strip().split("=")
-                    config_data[key.strip()] = value.strip()
-            return config_data
+            with open(filename, "r", buffering=1<<16) as config_file:
+                # Ignore comments and lines without an equals sign.
+                # Split on the first equals sign only, values such as URLs may contain more.
+                return dict(
+                    (key.strip(), value.strip())
+                    for line in config_file
+                    if '=' in line and not line.lstrip().startswith('#')
+                    for key, _, value in [line.partition("=")]
+                )
         except Exception as exception:
             self.logger.error(f"Error in reading config file: {str(exception)}")
             raise
 
     def extract_file_name(self, prompt):
         try:
-            # This pattern looks for typical file paths, names, and URLs, then stops at the end of the extension
-            pattern = r"((?:[a-zA-Z]:\\(?:[\w\-\.]+\\)*|/(?:[\w\-\.]+/)*|\b[\w\-\.]+\b|https?://[\w\-\.]+/[\w\-\.]+/)*[\w\-\.]+\.\w+)"
-            match = re.search(pattern, prompt)
-
-            # Return the matched file name or path, if any match found
-            if match:
+            # Return the first matched file name or path with a supported extension
+            for match in _FILE_RE.finditer(prompt):
                 file_name = match.group()
-                file_extension = os.path.splitext(file_name)[1].lower()
+                dot = file_name.rfind('.')
+                file_extension = file_name[dot:].lower()
                 self.logger.info(f"File extension: '{file_extension}'")
                 # Check if the file extension is one of the non-binary types
-                if file_extension in ['.json', '.csv', '.xml', '.xls', '.txt','.md','.html','.png','.jpg','.jpeg','.gif','.svg','.zip','.tar','.gz','.7z','.rar']:
+                if file_extension in _ALLOWED_EXTS:
                     self.logger.info(f"Extracted File name: '{file_name}'")
                     return file_name
-                else:
-                    return None
-            else:
-                return None
+            return None
         except Exception as exception:
             self.logger.error(f"Error in extracting file name: {str(exception)}")
             raise
 
-    def get_full_file_path(self, file_name):
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def get_full_file_path(file_name):
+        # Memoized, the interpreter never changes its own working directory (commands run in subprocesses).
         if not file_name:
             return None
 
@@ -144,16 +226,20 @@ class UtilityManager:
     def read_csv_headers(self,file_path):
         try:
             with open(file_path, newline='') as csvfile:
-                reader = csv.reader(csvfile)
-                headers = next(reader)
-                return headers
+                first_line = csvfile.readline()
         except IOError as exception:
             self.logger.error(f"IOError: {exception}")
             return []
-        except StopIteration:
+
+        if not first_line:
             self.logger.error("CSV file is empty.")
             return []
 
+        # Plain headers can be split directly, quoted headers still need the csv parser.
+        if '"' not in first_line:
+            return first_line.rstrip('\r\n').split(',')
+        return next(csv.reader([first_line]))
+
     def get_code_history(self, language='python'):
         try:
             self.logger.info("Starting to read last code history.")
@@ -161,51 +247,53 @@ class UtilityManager:
             file_extension = 'py' if language == 'python' else 'js'
             self.logger.info(f"Looking for files with extension: {file_extension}")
 
-            # Get a list of all files in the output folder with the correct extension
-            files = glob.glob(os.path.join(output_folder, f"*.{file_extension}"))
-            self.logger.info(f"Found {len(files)} files.")
+            # Reuse the last lookup while the output folder is unchanged.
+            try:
+                folder_mtime = os.stat(output_folder).st_mtime_ns
+            except FileNotFoundError:
+                folder_mtime = None
+
+            cached_mtime, latest_file = self._code_history_cache.get(file_extension, (None, None))
+            if folder_mtime is None or cached_mtime != folder_mtime:
+                # Get a list of all files in the output folder with the correct extension
+                files = []
+                if folder_mtime is not None:
+                    with os.scandir(output_folder) as entries:
+                        for entry in entries:
+                            match = _CODE_HISTORY_RE.fullmatch(entry.name)
+                            if match and match.group(2) == file_extension:
+                                files.append((match.group(1), entry.name))
+                self.logger.info(f"Found {len(files)} files.")
 
-            # Sort the files by date
-            files.sort(key=lambda x: datetime.strptime(x.split('_', 1)[1].rsplit('.', 1)[0], '%Y_%m_%d-%H_%M_%S'), reverse=True)
-            self.logger.info("Files sorted by date.")
+                # Pick the latest file by date, zero padded '%Y_%m_%d-%H_%M_%S' timestamps compare correctly as strings
+                latest_name = max(files, default=(None, None))[1]
 
-            # Return the latest file
-            latest_file = files[0] if files else None
+                # Build the path of the latest file only
+                latest_file = os.path.join(output_folder, latest_name) if latest_name else None
+                self._code_history_cache[file_extension] = (folder_mtime, latest_file)
             self.logger.info(f"Latest file: {latest_file}")
 
             # Read the file and return the code
             if latest_file:
-                with open(latest_file, "r") as code_file:
-                    code = code_file.read()
-                    return latest_file,code
+                code = pathlib.Path(latest_file).read_text()
+                return latest_file,code
 
         except Exception as exception:
             self.logger.error(f"Error in reading last code history: {str(exception)}")
             raise
 
     def display_help(self):
-        display_markdown_message("Interpreter\n\
-                \n\
-                Commands available:\n\
-                \n\
-                /exit - Exit the interpreter.\n\
-                /execute - Execute the last code generated.\n\
-                /install - Install a package from npm or pip.\n\
-                /save - Save the last code generated.\n\
-                /debug - Debug the last code generated.\n\
-                /mode - Change the mode of interpreter.\n\
-                /model - Change the model for interpreter.\n\
-                /language - Change the language of the interpreter.\n\
-                /history - Use history as memory.\n\
-                /clear - Clear the screen.\n\
-                /help - Display this help message.\n\
-                /version - Display the version of the interpreter.\n\
-                /log - Switch between Verbose and Silent mode.\n\
-                /upgrade - Upgrade the interpreter.\n\
-                /shell - Access the shell.\n")
+        display_markdown_message(_HELP_MD)
     
     def display_version(self,version):
         display_markdown_message(f"Interpreter - v{version}")
 
     def clear_screen(self):
-        os.system('cls' if os.name == 'nt' else 'clear')
\ No newline at end of file
+        # Older Windows consoles do not understand ANSI escape sequences.
+        if os.name == 'nt':
+            os.system('cls')
+            return
+
+        # Clear the screen and move the cursor home without spawning a shell.
+        sys.stdout.write('\x1b[H\x1b[2J\x1b[3J')
+        sys.stdout.flush()
@@ -0,0 +1,37 @@
+import json
+import os
+import tempfile
+import unittest
+from libs.history_manager import History
+
+class TestHistory(unittest.TestCase):
+    def test_append_history_jsonl(self):
+        with tempfile.TemporaryDirectory() as directory:
+            history = History(os.path.join(directory, "history.jsonl"))
+            history.append_history_jsonl("task 1", "code", "Linux", "python", "prompt 1", "print(1)", "1", "gpt-4")
+            history.append_history_jsonl("task 2", "code", "Linux", "python", "prompt 2", "print(2)", "2", "gpt-4")
+
+            with open(history.history_file) as history_file:
+                self.assertEqual(len(history_file.readlines()), 2)
+            self.assertEqual(history.get_code_history(1), [{"code": "print(2)", "output": "2"}])
+
+    def test_missing_history_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            history = History(os.path.join(directory, "history.jsonl"))
+            self.assertEqual(history.get_chat_history(1), [{"task": None, "output": None}])
+
+    def test_migrate_legacy_history(self):
+        with tempfile.TemporaryDirectory() as directory:
+            entry = {"assistant": {"task": "task 1"}, "user": "prompt 1", "system": {"code": "print(1)", "output": "1"}}
+            with open(os.path.join(directory, "history.json"), "w") as legacy_file:
+                json.dump([entry], legacy_file)
+
+            history = History(os.path.join(directory, "history.jsonl"))
+            self.assertEqual(history.get_code_history(1), [{"code": "print(1)", "output": "1"}])
+
+            history.append_history_jsonl("task 2", "code", "Linux", "python", "prompt 2", "print(2)", "2", "gpt-4")
+            history = History(os.path.join(directory, "history.jsonl"))
+            self.assertEqual(history.get_code_history(2), [{"code": "print(1)", "output": "1"}, {"code": "print(2)", "output": "2"}])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,29 @@
+import asyncio
+import os
+import tempfile
 import unittest
+from unittest.mock import AsyncMock, patch
 from interpreter import Interpreter
+from libs.interpreter_lib import _CHART_RE, _GRAPH_RE, _TABLE_RE
 from argparse import Namespace
+from types import SimpleNamespace
+
+class FakeStream:
+    def __init__(self, texts):
+        self.chunks = iter([SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))]) for text in texts])
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self.chunks)
+        except StopIteration:
+            raise StopAsyncIteration
+
+    async def aclose(self):
+        self.closed = True
 
 class TestInterpreter(unittest.TestCase):
     def test_interpreter_code_mode(self):
@@ -48,5 +71,74 @@ class TestInterpreter(unittest.TestCase):
         interpreter = Interpreter(args)
         self.assertEqual(interpreter.args.model, 'gpt-4')
 
+    def test_interpreter_prompt_cache(self):
+        args = Namespace(exec=True, save_code=True, mode='code', model='gpt-4', display_code=True, lang='python')
+        interpreter = Interpreter(args)
+        response = {'choices': [{'message': {'content': "```python\nprint('hello')\n```"}}]}
+        with patch('libs.interpreter_lib.acompletion', new=AsyncMock(return_value=response)) as acompletion:
+            first = interpreter.generate_content('print hello', [], config_values=interpreter.config_values)
+            second = interpreter.generate_content('print hello', [], config_values=interpreter.config_values)
+        self.assertEqual(first, second)
+        self.assertEqual(acompletion.await_count, 1)
+
+    def test_interpreter_generate_content_without_config(self):
+        args = Namespace(exec=True, save_code=True, mode='code', model='gpt-4', display_code=True, lang='python')
+        interpreter = Interpreter(args)
+        response = {'choices': [{'message': {'content': "```python\nprint('hello')\n```"}}]}
+        with patch('libs.interpreter_lib.acompletion', new=AsyncMock(return_value=response)) as acompletion:
+            generated_text = asyncio.run(interpreter.agenerate_content('print hello', [], config_values=None))
+        self.assertEqual(generated_text, "```python\nprint('hello')\n```")
+        self.assertNotIn('api_base', acompletion.await_args.kwargs)
+
+    def test_interpreter_prompt_cache_hugging_face_model(self):
+        args = Namespace(exec=True, save_code=True, mode='code', model='code-llama', display_code=True, lang='python')
+        interpreter = Interpreter(args)
+        model = interpreter.INTERPRETER_MODEL
+        response = {'choices': [{'message': {'content': "```python\nprint('hello')\n```"}}]}
+        with patch('libs.interpreter_lib.acompletion', new=AsyncMock(return_value=response)) as acompletion:
+            first = interpreter.generate_content('print hello', [], config_values=interpreter.config_values)
+            second = interpreter.generate_content('print hello', [], config_values=interpreter.config_values)
+        self.assertEqual(first, second)
+        self.assertEqual(acompletion.await_count, 1)
+        self.assertEqual(acompletion.await_args.args[0], 'huggingface/' + model)
+        self.assertEqual(interpreter.INTERPRETER_MODEL, model)
+
+    def test_interpreter_stream_stops_at_closing_fence(self):
+        args = Namespace(exec=True, save_code=True, mode='code', model='gpt-4', display_code=True, lang='python')
+        interpreter = Interpreter(args)
+        stream = FakeStream(["Here it is ``", "`python\nprint('hi')\n`", "``", " and more text"])
+        with patch('libs.interpreter_lib.acompletion', new=AsyncMock(return_value=stream)):
+            generated_text = interpreter.generate_content_stream('print hi', [], config_values=interpreter.config_values)
+        self.assertEqual(generated_text, "Here it is ```python\nprint('hi')\n```")
+        self.assertTrue(stream.closed)
+
+    def test_artifact_keywords(self):
+        for prompt in ['draw a graph', 'graphing sales', 'Charts of data', 'charting sales', 'plot data', 'plotting sales']:
+            self.assertTrue(_GRAPH_RE.search(prompt) or _CHART_RE.search(prompt), prompt)
+        for prompt in ['show a table', 'list the tables']:
+            self.assertIsNotNone(_TABLE_RE.search(prompt), prompt)
+        for prompt in ['sort a stable list', 'import Matplotlib', 'paragraph count']:
+            self.assertFalse(_GRAPH_RE.search(prompt) or _CHART_RE.search(prompt) or _TABLE_RE.search(prompt), prompt)
+
+    def test_binary_attachment_not_added_to_prompt(self):
+        args = Namespace(exec=False, save_code=False, mode='chat', model='gpt-4', display_code=False, lang='python')
+        interpreter = Interpreter(args)
+        with tempfile.TemporaryDirectory() as directory:
+            binary_file = os.path.join(directory, "sales.xls")
+            text_file = os.path.join(directory, "sales.txt")
+            with open(binary_file, "wb") as attachment:
+                attachment.write(bytes(range(256)) * 8)
+            with open(text_file, "w") as attachment:
+                attachment.write("region,total")
+
+            tasks = [f"make a chart from {binary_file}", f"make a chart from {text_file}", "/exit"]
+            with patch('builtins.input', side_effect=tasks), \
+                 patch.object(interpreter, 'generate_content', return_value='done') as generate_content:
+                interpreter.interpreter_main()
+
+        binary_prompt, text_prompt = (call.args[0] for call in generate_content.call_args_list)
+        self.assertNotIn("This is file data from user input", binary_prompt)
+        self.assertIn("This is file data from user input: region,total", text_prompt)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,108 @@
+import os
+import signal
+import tempfile
+import time
+import unittest
+from libs.utility_manager import UtilityManager
+
+class TestUtilityManager(unittest.TestCase):
+    def setUp(self):
+        self.utility_manager = UtilityManager()
+
+    def test_extract_file_name(self):
+        self.assertEqual(self.utility_manager.extract_file_name("plot a graph of sales.csv for me"), "sales.csv")
+        self.assertEqual(self.utility_manager.extract_file_name("describe /tmp/images/cat.png"), "/tmp/images/cat.png")
+
+    def test_extract_file_name_unsupported_extension(self):
+        self.assertIsNone(self.utility_manager.extract_file_name("run main.py"))
+        self.assertIsNone(self.utility_manager.extract_file_name("print hello world"))
+
+    def test_extract_file_name_long_prompt(self):
+        self.assertIsNone(self.utility_manager.extract_file_name("a-" * 200))
+        self.assertEqual(self.utility_manager.extract_file_name("a-" * 200 + " run main.py on data.csv"), "data.csv")
+
+    def test_read_csv_headers(self):
+        with tempfile.TemporaryDirectory() as directory:
+            plain_file = os.path.join(directory, "plain.csv")
+            with open(plain_file, "w", newline='') as csv_file:
+                csv_file.write("name,age\r\nalice,30\r\n")
+            quoted_file = os.path.join(directory, "quoted.csv")
+            with open(quoted_file, "w", newline='') as csv_file:
+                csv_file.write('"last, first",age\n')
+            empty_file = os.path.join(directory, "empty.csv")
+            open(empty_file, "w").close()
+
+            self.assertEqual(self.utility_manager.read_csv_headers(plain_file), ["name", "age"])
+            self.assertEqual(self.utility_manager.read_csv_headers(quoted_file), ["last, first", "age"])
+            self.assertEqual(self.utility_manager.read_csv_headers(empty_file), [])
+
+    def test_read_config_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            config_file = os.path.join(directory, "model.config")
+            with open(config_file, "w") as config:
+                config.write("# temperature = 0.5\n temperature = 0.1\nskip_first_line = True\napi_base = https://host/v1?key=value\nno separator\n")
+
+            self.assertEqual(self.utility_manager.read_config_file(config_file), {
+                "temperature": "0.1",
+                "skip_first_line": "True",
+                "api_base": "https://host/v1?key=value"
+            })
+
+    def test_get_code_history(self):
+        current_directory = os.getcwd()
+        with tempfile.TemporaryDirectory() as directory:
+            try:
+                os.chdir(directory)
+                os.makedirs("output")
+                for name, code in [("code_2024_01_02-03_04_05.py", "old"), ("code_2024_11_02-03_04_05.py", "new"), ("test.py", "manual"), ("script.py", "manual")]:
+                    with open(os.path.join("output", name), "w") as code_file:
+                        code_file.write(code)
+
+                self.assertEqual(self.utility_manager.get_code_history('python'), (os.path.join("output", "code_2024_11_02-03_04_05.py"), "new"))
+                self.assertIsNone(self.utility_manager.get_code_history('javascript'))
+            finally:
+                os.chdir(current_directory)
+
+    @unittest.skipUnless(os.name == 'posix', "requires a POSIX shell for the stub opener")
+    def test_open_with_helper(self):
+        with tempfile.TemporaryDirectory() as directory:
+            opened_log = os.path.join(directory, "opened.log")
+            stub_opener = os.path.join(directory, "stub-open")
+            with open(stub_opener, "w") as opener:
+                opener.write(f'#!/bin/sh\necho "$1" >> "{opened_log}"\n')
+            os.chmod(stub_opener, 0o755)
+
+            self.utility_manager._open_command = stub_opener
+            names = [os.path.join(directory, name) for name in ("graph.png", "chart.png", "table.md")]
+
+            def wait_for_opened(count):
+                deadline = time.monotonic() + 5
+                while time.monotonic() < deadline:
+                    if os.path.exists(opened_log):
+                        with open(opened_log) as log:
+                            if len(log.readlines()) == count:
+                                return
+                    time.sleep(0.01)
+
+            for name in names[:2]:
+                self.utility_manager._open_with_helper(name)
+            helper = self.utility_manager._opener_process
+            try:
+                wait_for_opened(2)
+
+                # The helper runs in its own session and ignores Ctrl-C from the interpreter's terminal.
+                self.assertNotEqual(os.getsid(helper.pid), os.getsid(0))
+                os.kill(helper.pid, signal.SIGINT)
+                self.utility_manager._open_with_helper(names[2])
+                wait_for_opened(3)
+
+                self.assertIsNone(helper.poll())
+                self.assertIs(self.utility_manager._opener_process, helper)
+                with open(opened_log) as log:
+                    self.assertEqual(sorted(log.read().split()), sorted(names))
+            finally:
+                helper.stdin.close()
+                helper.wait(timeout=5)
+
+if __name__ == '__main__':
+    unittest.main()